@@ -11,15 +11,253 @@ from datetime import datetime
 from playwright.async_api import async_playwright, Page, TimeoutError as PlaywrightTimeout
 import argparse
 
+# The embedded rehydration blobs run to hundreds of KB; orjson parses them
+# several times faster than stdlib json when it's available
+try:
+    import orjson
+
+    _HAS_ORJSON = True
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, default=str)
+except ImportError:
+    _HAS_ORJSON = False
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, default=str).encode('utf-8')
+
+# Scraped JSON is highly repetitive and compresses 5-15x with zstd
+try:
+    import zstandard as zstd
+
+    _HAS_ZSTD = True
+except ImportError:
+    _HAS_ZSTD = False
+
+# MessagePack output for pipelines: ~30-50% smaller than JSON and faster
+# to encode/decode on the consuming side
+try:
+    import ormsgpack
+
+    _HAS_ORMSGPACK = True
+except ImportError:
+    _HAS_ORMSGPACK = False
+
+
+_VIDEO_ID_RE = re.compile(r'/video/(\d+)')
+
+# Suffix multipliers for abbreviated counts like '1.2K' or '3M'
+_COUNT_SUFFIXES = {'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+
+# Known locations of video items inside __DEFAULT_SCOPE__; looked up
+# directly instead of substring-matching every key in the scope dict
+_KNOWN_ITEM_KEYS = (
+    'webapp.challenge-detail.itemList',
+    'itemList',
+    'ItemList',
+    'itemModule',
+    'ItemModule',
+)
+
+# Hot-path extractors are installed once per document via add_init_script so
+# each evaluate ships a short invocation instead of re-sending (and V8
+# re-compiling) the full JS source on every call
+_INIT_SCRIPT_JS = """
+window.__scrapeNewGridItems = (seen) => {
+    const s = new Set(seen);
+    const out = [];
+    for (const el of document.querySelectorAll('[data-e2e="challenge-item"]')) {
+        const a = el.querySelector('a');
+        const href = a && a.getAttribute('href');
+        if (href && !s.has(href)) {
+            s.add(href);
+            out.push({ href: href, text: el.innerText });
+        }
+    }
+    return out;
+};
+window.__scrapeScrollAndMeasure = () => {
+    const b = document.body.scrollHeight;
+    window.scrollTo(0, b);
+    return { before: b, after: document.body.scrollHeight };
+};
+window.__scrapeScrollComments = () => {
+    const commentSection = document.querySelector('[data-e2e="comment-list"]') ||
+                           document.querySelector('[class*="CommentList"]');
+    if (commentSection) {
+        commentSection.scrollTop = commentSection.scrollHeight;
+    } else {
+        window.scrollTo(0, document.body.scrollHeight);
+    }
+};
+window.__scrapeComments = (opts) => {
+    const pick = (el, sels) => {
+        for (const s of sels) {
+            const n = el.querySelector(s);
+            if (n) return n.innerText;
+        }
+        return '';
+    };
+    return Array.from(document.querySelectorAll('[data-e2e="comment-level-1"]'))
+        .slice(0, opts.max)
+        .map(el => ({
+            text: pick(el, opts.text) || el.innerText,
+            username: pick(el, opts.user),
+            like_text: pick(el, opts.like),
+            timestamp: pick(el, opts.time)
+        }));
+};
+"""
+
+# TikTok embeds its rehydration JSON in uniquely-ID'd script tags; hit them
+# directly with getElementById instead of scanning every <script> on the page
+_JSON_SCRIPT_JS = """
+    () => {
+        const a = document.getElementById('__UNIVERSAL_DATA_FOR_REHYDRATION__');
+        if (a) return a.textContent;
+        const b = document.getElementById('SIGI_STATE');
+        return b ? b.textContent : null;
+    }
+"""
+
+
+class BackpressureController:
+    """
+    AIMD controller for the delay between video page requests.
+
+    A fixed video_delay is either too slow when TikTok is healthy or too
+    fast when it starts throttling. Successful, quick page loads shrink
+    the delay additively; failures and latency spikes (the usual blocking
+    signal seen from a browser context) grow it multiplicatively so the
+    scraper backs off before getting blocked outright.
+    """
+
+    def __init__(
+        self,
+        base_delay: float = 1.5,
+        min_delay: float = 0.2,
+        max_delay: float = 30.0,
+        decrease: float = 0.1,
+        backoff: float = 2.0,
+        latency_target: float = 2.0
+    ):
+        self.delay = base_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.decrease = decrease
+        self.backoff = backoff
+        self.latency_target = latency_target
+
+    def record(self, latency: float, ok: bool):
+        """Update the delay from the outcome of one page request"""
+        if ok and latency <= self.latency_target:
+            self.delay = max(self.min_delay, self.delay - self.decrease)
+        else:
+            self.delay = min(self.max_delay, self.delay * self.backoff)
+
 
 class TikTokHashtagScraper:
     """Scraper for TikTok hashtag pages"""
     
-    def __init__(self, headless: bool = True, proxy: Optional[str] = None):
+    def __init__(
+        self,
+        headless: bool = True,
+        proxy: Optional[str] = None,
+        storage_state: Optional[str] = None
+    ):
         self.headless = headless
         self.proxy = proxy
+        self.storage_state = storage_state
         self.base_url = "https://www.tiktok.com/tag/{}"
-        
+        # Long-lived Playwright handles, created lazily on first scrape so
+        # browser startup is paid once per scraper instead of once per call
+        self._pw = None
+        self._browser = None
+        self._context = None
+
+    async def __aenter__(self):
+        await self._ensure_browser()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def _ensure_browser(self):
+        """Lazily start Playwright and launch the shared browser/context"""
+        if self._context is not None:
+            return self._context
+
+        self._pw = await async_playwright().start()
+
+        # Launch browser with anti-detection settings
+        browser_args = {
+            'headless': self.headless,
+            'args': [
+                '--disable-blink-features=AutomationControlled',
+                '--disable-dev-shm-usage',
+                '--no-sandbox',
+            ]
+        }
+
+        if self.proxy:
+            browser_args['proxy'] = {'server': self.proxy}
+
+        self._browser = await self._pw.chromium.launch(**browser_args)
+
+        # Create context with realistic settings
+        context_args = {
+            'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+            'viewport': {'width': 1920, 'height': 1080},
+            'locale': 'en-US',
+            'timezone_id': 'America/New_York'
+        }
+
+        # Reuse cookies/login from a previous run when provided
+        if self.storage_state:
+            import os
+            if os.path.exists(self.storage_state):
+                context_args['storage_state'] = self.storage_state
+
+        self._context = await self._browser.new_context(**context_args)
+
+        # Install the hot-path extractors once per document; evaluates then
+        # just invoke them by name
+        await self._context.add_init_script(_INIT_SCRIPT_JS)
+
+        # Block heavy resources we never read: thumbnails, autoplay video
+        # and fonts account for most of the bytes on TikTok pages.
+        # Stylesheets stay enabled because innerText depends on layout.
+        await self._context.route('**/*', self._block_heavy_resources)
+
+        return self._context
+
+    @staticmethod
+    async def _block_heavy_resources(route):
+        if route.request.resource_type in ('image', 'media', 'font'):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def aclose(self):
+        """Close the shared browser and stop Playwright"""
+        if self._context is not None:
+            if self.storage_state:
+                try:
+                    await self._context.storage_state(path=self.storage_state)
+                except Exception as e:
+                    print(f"⚠️ Could not persist storage state: {str(e)}")
+            await self._context.close()
+            self._context = None
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._pw is not None:
+            await self._pw.stop()
+            self._pw = None
+
+
     async def scrape_hashtag(
         self, 
         hashtag: str, 
@@ -28,11 +266,14 @@ class TikTokHashtagScraper:
         detailed_scrape: bool = False,
         video_delay: float = 1.5,
         scrape_comments: bool = False,
-        max_comments: int = 20
+        max_comments: int = 20,
+        concurrency: int = 8,
+        output_stream = None,
+        checkpoint_path: Optional[str] = None
     ) -> Dict:
         """
         Scrape videos from a TikTok hashtag
-        
+
         Args:
             hashtag: The hashtag to scrape (with or without #)
             max_videos: Maximum number of videos to scrape
@@ -41,6 +282,14 @@ class TikTokHashtagScraper:
             video_delay: Delay between video page requests (seconds)
             scrape_comments: If True, scrape comments from each video
             max_comments: Maximum comments to scrape per video
+            concurrency: Number of video pages to scrape in parallel
+            output_stream: Optional binary file; each video is written to it
+                as one JSON line the moment it finishes, so callers can
+                stream results instead of holding everything in memory
+            checkpoint_path: Optional path to a text file of video IDs that
+                were already detail-scraped; those videos are skipped and
+                newly finished IDs are appended, so an interrupted run can
+                resume where it left off
             
         Returns:
             Dictionary with hashtag info and list of videos
@@ -56,72 +305,102 @@ class TikTokHashtagScraper:
         if scrape_comments:
             print(f"💬 Comment scraping enabled - will scrape up to {max_comments} comments per video")
         
-        async with async_playwright() as p:
-            # Launch browser with anti-detection settings
-            browser_args = {
-                'headless': self.headless,
-                'args': [
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                ]
-            }
-            
-            if self.proxy:
-                browser_args['proxy'] = {'server': self.proxy}
-            
-            browser = await p.chromium.launch(**browser_args)
-            
-            # Create context with realistic settings
-            context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                viewport={'width': 1920, 'height': 1080},
-                locale='en-US',
-                timezone_id='America/New_York'
-            )
-            
-            page = await context.new_page()
-            print(f"🌐 Browser opened: {page}")
+        context = await self._ensure_browser()
 
-            
-            try:
-                # Navigate to hashtag page
-                await page.goto(url, wait_until='domcontentloaded', timeout=30000)
-                print(f"🌐 Navigated to hashtag page: {url}")
+        # Per-call state: concurrent scrape_hashtag calls on one scraper
+        # must not share or clobber each other's tabs and CDP sessions
+        cdp_sessions: Dict = {}
+        page_pool: Optional[asyncio.Queue] = None
 
-                await page.get_by_role("button", name="Refresh").click()
+        page = await context.new_page()
+        print(f"🌐 Browser opened: {page}")
 
+        # Pre-open a pool of tabs for detailed scraping so each video
+        # reuses a page instead of paying new_page/close per request
+        if detailed_scrape:
+            page_pool = asyncio.Queue()
+            for _ in range(concurrency):
+                await page_pool.put(await context.new_page())
 
+        try:
+            # Navigate to hashtag page
+            await page.goto(url, wait_until='domcontentloaded', timeout=30000)
+            print(f"🌐 Navigated to hashtag page: {url}")
 
-                
-                # Wait for content to load
-                await asyncio.sleep(3)
-                
-                # Extract hashtag info and videos
-                hashtag_data = await self._extract_hashtag_data(
-                    page, hashtag, max_videos, scroll_pause, 
-                    context if detailed_scrape else None, 
-                    video_delay,
-                    scrape_comments,
-                    max_comments
+            await page.get_by_role("button", name="Refresh").click()
+
+            # Wait for actual content instead of a fixed sleep; either the
+            # grid or the rehydration script means the page is usable
+            try:
+                await page.wait_for_selector(
+                    '[data-e2e="challenge-item"], script#__UNIVERSAL_DATA_FOR_REHYDRATION__, script#SIGI_STATE',
+                    state='attached',
+                    timeout=10000
                 )
-                
-                print(f"✅ Successfully scraped {len(hashtag_data.get('videos', []))} videos")
-                
-                return hashtag_data
-                
             except PlaywrightTimeout:
-                print(f"⚠️ Timeout while loading page. TikTok may be blocking requests.")
-                return {'hashtag': hashtag, 'videos': [], 'error': 'timeout'}
-                
-            except Exception as e:
-                print(f"❌ Error: {str(e)}")
-                return {'hashtag': hashtag, 'videos': [], 'error': str(e)}
-                
-            finally:
-                await browser.close()
+                print("⚠️ Content selector never appeared, continuing anyway")
+
+            # Extract hashtag info and videos
+            hashtag_data = await self._extract_hashtag_data(
+                page, hashtag, max_videos, scroll_pause,
+                context if detailed_scrape else None,
+                video_delay,
+                scrape_comments,
+                max_comments,
+                concurrency,
+                output_stream,
+                checkpoint_path,
+                page_pool,
+                cdp_sessions
+            )
+
+            print(f"✅ Successfully scraped {len(hashtag_data.get('videos', []))} videos")
+
+            return hashtag_data
+
+        except PlaywrightTimeout:
+            print(f"⚠️ Timeout while loading page. TikTok may be blocking requests.")
+            return {'hashtag': hashtag, 'videos': [], 'error': 'timeout'}
+
+        except Exception as e:
+            print(f"❌ Error: {str(e)}")
+            return {'hashtag': hashtag, 'videos': [], 'error': str(e)}
+
+        finally:
+            cdp_sessions.clear()
+            if page_pool is not None:
+                while not page_pool.empty():
+                    pooled_page = page_pool.get_nowait()
+                    await pooled_page.close()
+            await page.close()
 
     
+    async def _evaluate(self, page: Page, js: str, cdp_sessions: Optional[Dict] = None):
+        """
+        Evaluate an argument-less JS function via a raw CDP session.
+
+        Speaking Runtime.evaluate directly over one persistent CDP session
+        skips Playwright's handle orchestration, which adds up on the paths
+        that evaluate hundreds of times per scrape. Sessions are cached in
+        the caller-owned cdp_sessions dict (one per page); without one, or
+        if the CDP session can't be used, falls back to page.evaluate.
+        """
+        if cdp_sessions is None:
+            return await page.evaluate(js)
+        try:
+            cdp = cdp_sessions.get(page)
+            if cdp is None:
+                cdp = await page.context.new_cdp_session(page)
+                cdp_sessions[page] = cdp
+            result = await cdp.send("Runtime.evaluate", {
+                "expression": f"({js})()",
+                "returnByValue": True,
+                "awaitPromise": True,
+            })
+            return result.get("result", {}).get("value")
+        except Exception:
+            return await page.evaluate(js)
+
     async def _extract_hashtag_data(
         self, 
         page: Page, 
@@ -131,52 +410,54 @@ class TikTokHashtagScraper:
         context = None,
         video_delay: float = 1.5,
         scrape_comments: bool = False,
-        max_comments: int = 20
+        max_comments: int = 20,
+        concurrency: int = 8,
+        output_stream = None,
+        checkpoint_path: Optional[str] = None,
+        page_pool: Optional[asyncio.Queue] = None,
+        cdp_sessions: Optional[Dict] = None
     ) -> Dict:
         """Extract hashtag information and video data from the page"""
-        
+
         # Try to extract from JSON data first
-        hashtag_info = await self._extract_from_json(page, hashtag)
-        
+        hashtag_info = await self._extract_from_json(page, hashtag, cdp_sessions)
+
+        # When streaming, lead the file with a type-tagged hashtag_info
+        # record so consumers can tell it apart from video lines
+        if output_stream is not None:
+            meta = {k: v for k, v in hashtag_info.items() if k != 'videos'}
+            meta['type'] = 'hashtag_info'
+            output_stream.write(_dumps(meta) + b'\n')
+
         # If JSON extraction fails, try scrolling and extracting from HTML
         if not hashtag_info.get('videos'):
             print("📜 JSON extraction incomplete, attempting HTML scraping with scrolling...")
             videos = await self._scrape_videos_by_scrolling(
-                page, max_videos, scroll_pause, context, video_delay, 
-                scrape_comments, max_comments
+                page, max_videos, scroll_pause, context, video_delay,
+                scrape_comments, max_comments, concurrency, output_stream,
+                checkpoint_path, page_pool, cdp_sessions
             )
             hashtag_info['videos'] = videos
-        
+        elif output_stream is not None:
+            # JSON extraction already produced the videos; stream them too
+            for video in hashtag_info['videos']:
+                output_stream.write(_dumps(video) + b'\n')
+
         return hashtag_info
     
-    async def _extract_from_json(self, page: Page, hashtag: str) -> Dict:
+    async def _extract_from_json(self, page: Page, hashtag: str, cdp_sessions: Optional[Dict] = None) -> Dict:
         """Extract data from embedded JSON in the page"""
-        
+
         try:
             # TikTok embeds data in script tags
-            script_data = await page.evaluate("""
-                () => {
-                    const scripts = document.querySelectorAll('script');
-                    for (let script of scripts) {
-                        if (script.id === '__UNIVERSAL_DATA_FOR_REHYDRATION__' || 
-                            script.id === 'SIGI_STATE') {
-                            try {
-                                return script.textContent;
-                            } catch (e) {
-                                continue;
-                            }
-                        }
-                    }
-                    return null;
-                }
-            """)
-            
+            script_data = await self._evaluate(page, _JSON_SCRIPT_JS, cdp_sessions)
+
             if not script_data:
                 print("⚠️ Could not find embedded JSON data")
                 return {'hashtag': hashtag, 'videos': []}
             
             # Parse JSON
-            data = json.loads(script_data)
+            data = _loads(script_data)
             
             # Extract hashtag info and videos
             hashtag_info = self._parse_hashtag_json(data, hashtag)
@@ -216,16 +497,21 @@ class TikTokHashtagScraper:
                             'is_commerce': info.get('isCommerce', False)
                         }
                 
-                # Look for video items
-                for key in scope:
-                    if 'itemList' in str(key) or 'itemModule' in str(key):
-                        items = scope[key]
-                        if isinstance(items, dict):
-                            for item_id, item_data in items.items():
-                                if isinstance(item_data, dict) and 'video' in item_data:
-                                    video = self._parse_video_item(item_data)
-                                    if video:
-                                        result['videos'].append(video)
+                # Look for video items under the known scope keys
+                found_items = False
+                for key in _KNOWN_ITEM_KEYS:
+                    items = scope.get(key)
+                    if isinstance(items, dict):
+                        found_items = True
+                        for item_id, item_data in items.items():
+                            if isinstance(item_data, dict) and 'video' in item_data:
+                                video = self._parse_video_item(item_data)
+                                if video:
+                                    result['videos'].append(video)
+
+                if not found_items:
+                    # Surface TikTok schema changes quickly
+                    print("⚠️ No known item-list key found in __DEFAULT_SCOPE__")
         
         except Exception as e:
             print(f"⚠️ Error parsing JSON: {str(e)}")
@@ -236,39 +522,46 @@ class TikTokHashtagScraper:
         """Parse individual video item from JSON"""
         
         try:
+            # Resolve each subtree once instead of re-walking item for
+            # every field (each .get('x', {}) allocated a throwaway dict)
+            author = item.get('author') or {}
+            stats = item.get('stats') or {}
+            video = item.get('video') or {}
+            music = item.get('music') or {}
+
             video_data = {
                 'id': item.get('id'),
                 'description': item.get('desc', ''),
                 'created_at': item.get('createTime'),
                 'author': {
-                    'id': item.get('author', {}).get('id'),
-                    'username': item.get('author', {}).get('uniqueId'),
-                    'nickname': item.get('author', {}).get('nickname'),
-                    'verified': item.get('author', {}).get('verified', False),
-                    'avatar': item.get('author', {}).get('avatarThumb')
+                    'id': author.get('id'),
+                    'username': author.get('uniqueId'),
+                    'nickname': author.get('nickname'),
+                    'verified': author.get('verified', False),
+                    'avatar': author.get('avatarThumb')
                 },
                 'stats': {
-                    'views': item.get('stats', {}).get('playCount', 0),
-                    'likes': item.get('stats', {}).get('diggCount', 0),
-                    'comments': item.get('stats', {}).get('commentCount', 0),
-                    'shares': item.get('stats', {}).get('shareCount', 0)
+                    'views': stats.get('playCount', 0),
+                    'likes': stats.get('diggCount', 0),
+                    'comments': stats.get('commentCount', 0),
+                    'shares': stats.get('shareCount', 0)
                 },
                 'video': {
-                    'duration': item.get('video', {}).get('duration'),
-                    'ratio': item.get('video', {}).get('ratio'),
-                    'cover': item.get('video', {}).get('cover'),
-                    'download_url': item.get('video', {}).get('downloadAddr'),
-                    'play_url': item.get('video', {}).get('playAddr')
+                    'duration': video.get('duration'),
+                    'ratio': video.get('ratio'),
+                    'cover': video.get('cover'),
+                    'download_url': video.get('downloadAddr'),
+                    'play_url': video.get('playAddr')
                 },
                 'music': {
-                    'id': item.get('music', {}).get('id'),
-                    'title': item.get('music', {}).get('title'),
-                    'author': item.get('music', {}).get('authorName')
+                    'id': music.get('id'),
+                    'title': music.get('title'),
+                    'author': music.get('authorName')
                 },
-                'hashtags': [tag.get('title') for tag in item.get('challenges', [])],
-                'url': f"https://www.tiktok.com/@{item.get('author', {}).get('uniqueId')}/video/{item.get('id')}"
+                'hashtags': [tag.get('title') for tag in item.get('challenges') or []],
+                'url': f"https://www.tiktok.com/@{author.get('uniqueId')}/video/{item.get('id')}"
             }
-            
+
             return video_data
             
         except Exception as e:
@@ -283,12 +576,17 @@ class TikTokHashtagScraper:
         context = None,
         video_delay: float = 1.5,
         scrape_comments: bool = False,
-        max_comments: int = 20
+        max_comments: int = 20,
+        concurrency: int = 8,
+        output_stream = None,
+        checkpoint_path: Optional[str] = None,
+        page_pool: Optional[asyncio.Queue] = None,
+        cdp_sessions: Optional[Dict] = None
     ) -> List[Dict]:
         """Scrape videos by scrolling the page and extracting from HTML"""
         
         videos = []
-        last_height = 0
+        seen_urls = set()
         scroll_attempts = 0
         max_scroll_attempts = 20
         
@@ -296,72 +594,115 @@ class TikTokHashtagScraper:
         
         while len(videos) < max_videos and scroll_attempts < max_scroll_attempts:
 
-            # Extract video links from current view
-            video_elements = await page.query_selector_all('[data-e2e="challenge-item"]')
-            
-            for element in video_elements:
+            # Extract link and visible text for *new* grid items only, in a
+            # single evaluate call: already-seen URLs are filtered DOM-side
+            # so flaky or duplicate elements never cost another round-trip
+            new_items = await page.evaluate(
+                'seen => window.__scrapeNewGridItems(seen)', list(seen_urls)
+            )
+
+            for item in new_items:
                 if len(videos) >= max_videos:
                     break
-                
-                try:
-                    # Extract video URL
-                    link = await element.query_selector('a')
-                    if link:
-                        href = await link.get_attribute('href')
-                        if href and href not in [v.get('url') for v in videos]:
-                            # Extract basic info from visible elements
-                            video_info = await self._extract_video_info_from_element(element, href)
-                            if video_info:
-                                videos.append(video_info)
-                                print(f"  📹 Collected video {len(videos)}/{max_videos}")
-                
-                except Exception as e:
-                    continue
-            
-            # Scroll down
-            current_height = await page.evaluate('document.body.scrollHeight')
-            await page.evaluate('window.scrollTo(0, document.body.scrollHeight)')
-            await asyncio.sleep(scroll_pause)
-            
-            new_height = await page.evaluate('document.body.scrollHeight')
+
+                href = item['href']
+                seen_urls.add(href)
+                # Build basic info from the already-extracted fields
+                video_info = self._build_video_info(href, item.get('text') or '')
+                if video_info:
+                    videos.append(video_info)
+                    print(f"  📹 Collected video {len(videos)}/{max_videos}")
             
-            # Check if we've reached the bottom
-            if new_height == current_height:
-                scroll_attempts += 1
-            else:
+            # Scroll down: read height, scroll and re-read in one round-trip
+            # instead of three separate evaluates
+            heights = await self._evaluate(page, '() => window.__scrapeScrollAndMeasure()', cdp_sessions)
+
+            # Wait only until new content actually grows the page, capped at
+            # scroll_pause; hitting the cap counts as a bottom-of-page attempt
+            try:
+                await page.wait_for_function(
+                    'h => document.body.scrollHeight > h',
+                    arg=heights['before'],
+                    timeout=int(scroll_pause * 1000)
+                )
                 scroll_attempts = 0
-            
-            last_height = new_height
-        
+            except PlaywrightTimeout:
+                scroll_attempts += 1
+
         # If detailed scraping is enabled, visit each video page
+        # (concurrently, bounded by a semaphore so only `concurrency` tabs work at once)
         if context:
-            print(f"\n🔬 Starting detailed scraping for {len(videos)} videos...")
-            detailed_videos = []
-            for i, video in enumerate(videos, 1):
-                print(f"  📹 Scraping details for video {i}/{len(videos)}: {video.get('url')}")
-                detailed_info = await self.scrape_video_details(
-                    video['url'], context, video_delay, scrape_comments, max_comments
-                )
-                if detailed_info:
-                    detailed_videos.append(detailed_info)
-                else:
+            print(f"\n🔬 Starting detailed scraping for {len(videos)} videos ({concurrency} in parallel)...")
+            sem = asyncio.Semaphore(concurrency)
+            controller = BackpressureController(base_delay=video_delay)
+
+            # IDs finished on previous runs get skipped; newly finished ones
+            # are appended (and flushed) so a crash costs one video at most
+            done_ids = set()
+            ckpt_file = None
+            if checkpoint_path:
+                try:
+                    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+                        done_ids = {line.strip() for line in f if line.strip()}
+                except FileNotFoundError:
+                    pass
+                if done_ids and output_stream is None:
+                    # Without an append stream the previous run's records are
+                    # not in the output we are about to write, so skipping
+                    # would replace them with bare scroll stubs — re-fetch
+                    print(f"  ⚠️ Checkpoint found but output is not appendable; re-scraping {len(done_ids)} videos")
+                    done_ids = set()
+                elif done_ids:
+                    print(f"  ⏩ Resuming: {len(done_ids)} videos already scraped")
+                ckpt_file = open(checkpoint_path, 'a', encoding='utf-8')
+
+            async def _bounded_details(video: Dict) -> Dict:
+                video_id = video.get('id')
+                if video_id and video_id in done_ids:
+                    # Already fetched by a previous run and present in the
+                    # appended output; keep the basic info
+                    return video
+                async with sem:
+                    try:
+                        detailed_info = await self.scrape_video_details(
+                            video['url'], context, video_delay, scrape_comments, max_comments,
+                            controller=controller, page_pool=page_pool,
+                            cdp_sessions=cdp_sessions
+                        )
+                    except Exception:
+                        detailed_info = None
                     # If detailed scraping fails, keep the basic info
-                    detailed_videos.append(video)
+                    result = detailed_info or video
+                    if output_stream is not None:
+                        # Stream each video out the moment it finishes
+                        output_stream.write(_dumps(result) + b'\n')
+                    if ckpt_file is not None and detailed_info and video_id:
+                        ckpt_file.write(video_id + '\n')
+                        ckpt_file.flush()
+                    return result
+
+            try:
+                detailed_videos = list(await asyncio.gather(
+                    *(_bounded_details(v) for v in videos)
+                ))
+            finally:
+                if ckpt_file is not None:
+                    ckpt_file.close()
             return detailed_videos[:max_videos]
-        
+
+        if output_stream is not None:
+            for video in videos[:max_videos]:
+                output_stream.write(_dumps(video) + b'\n')
         return videos[:max_videos]
     
-    async def _extract_video_info_from_element(self, element, url: str) -> Optional[Dict]:
-        """Extract video information from HTML element"""
-        
+    def _build_video_info(self, url: str, stats_text: str) -> Optional[Dict]:
+        """Build basic video information from an already-extracted grid item"""
+
         try:
             # Extract video ID from URL
-            video_id = re.search(r'/video/(\d+)', url)
-            video_id = video_id.group(1) if video_id else None
-            
-            # Try to extract visible stats
-            stats_text = await element.inner_text()
-            
+            m = _VIDEO_ID_RE.search(url)
+            video_id = m.group(1) if m else None
+
             return {
                 'id': video_id,
                 'url': url if url.startswith('http') else f"https://www.tiktok.com{url}",
@@ -384,80 +725,117 @@ class TikTokHashtagScraper:
         context,
         delay: float = 1.5,
         scrape_comments: bool = False,
-        max_comments: int = 20
+        max_comments: int = 20,
+        controller: Optional[BackpressureController] = None,
+        page_pool: Optional[asyncio.Queue] = None,
+        cdp_sessions: Optional[Dict] = None
     ) -> Optional[Dict]:
         """
         Scrape detailed information from an individual video page
-        
+
         Args:
             video_url: URL of the video to scrape
             context: Browser context to use
             delay: Delay before scraping (seconds)
             scrape_comments: Whether to scrape comments
             max_comments: Maximum number of comments to scrape
-            
+            controller: Optional AIMD controller; when given, its adaptive
+                delay replaces the fixed one and it is fed the outcome of
+                each request
+            page_pool: Optional queue of reusable tabs; when given, a tab is
+                borrowed and returned instead of opened and closed per call
+            cdp_sessions: Optional per-page CDP session cache for _evaluate
+
         Returns:
             Dictionary with detailed video information
         """
+        start = None
         try:
             # Add random jitter to delay
             import random
-            actual_delay = delay + random.uniform(0, 0.5)
+            base_delay = controller.delay if controller is not None else delay
+            actual_delay = base_delay + random.uniform(0, 0.5)
             await asyncio.sleep(actual_delay)
-            
-            page = await context.new_page()
-            
+            start = asyncio.get_event_loop().time()
+
+            # Borrow a tab from the pool when available; fall back to a
+            # throwaway page so the method still works standalone
+            pooled = page_pool is not None
+            if pooled:
+                page = await page_pool.get()
+            else:
+                page = await context.new_page()
+
             try:
-                # Navigate to video page
+                # Navigate to video page and wait for the rehydration script
                 await page.goto(video_url, wait_until='domcontentloaded', timeout=30000)
-                await asyncio.sleep(2)
+                try:
+                    await page.wait_for_selector(
+                        'script#__UNIVERSAL_DATA_FOR_REHYDRATION__, script#SIGI_STATE',
+                        state='attached',
+                        timeout=10000
+                    )
+                except PlaywrightTimeout:
+                    pass
                 
                 # Extract JSON data from the page
-                script_data = await page.evaluate("""
-                    () => {
-                        const scripts = document.querySelectorAll('script');
-                        for (let script of scripts) {
-                            if (script.id === '__UNIVERSAL_DATA_FOR_REHYDRATION__' || 
-                                script.id === 'SIGI_STATE') {
-                                try {
-                                    return script.textContent;
-                                } catch (e) {
-                                    continue;
-                                }
-                            }
-                        }
-                        return null;
-                    }
-                """)
-                
+                script_data = await self._evaluate(page, _JSON_SCRIPT_JS, cdp_sessions)
+
                 if not script_data:
                     print(f"  ⚠️ No JSON data found for {video_url}")
+                    if controller is not None:
+                        # Missing JSON usually means TikTok is throttling us
+                        controller.record(asyncio.get_event_loop().time() - start, ok=False)
                     return None
-                
+
                 # Parse the JSON data
-                data = json.loads(script_data)
+                data = _loads(script_data)
                 video_details = self._parse_video_details_json(data, video_url)
+
+                if controller is not None:
+                    controller.record(
+                        asyncio.get_event_loop().time() - start,
+                        ok=video_details is not None
+                    )
                 
                 # Scrape comments if requested
                 if scrape_comments and video_details:
                     comment_count = video_details.get('stats', {}).get('comments', 0)
                     if comment_count > 0:
                         print(f"    💬 Scraping comments (video has {comment_count} comments)...")
-                        comments = await self._scrape_comments_from_page(page, max_comments)
+                        comments = await self._scrape_comments_from_page(page, max_comments, cdp_sessions)
                         if comments:
                             video_details['comments'] = comments
                             print(f"    ✅ Scraped {len(comments)} comments")
                 
                 return video_details
-                
+
             finally:
-                await page.close()
+                if pooled:
+                    # Reset state and hand the tab back instead of closing
+                    # it. If the reset fails the tab is broken — replace it
+                    # with a fresh one so the pool never loses a slot
+                    try:
+                        await page.goto("about:blank")
+                    except Exception:
+                        if cdp_sessions is not None:
+                            cdp_sessions.pop(page, None)
+                        try:
+                            await page.close()
+                        except Exception:
+                            pass
+                        page = await context.new_page()
+                    await page_pool.put(page)
+                else:
+                    await page.close()
                 
         except Exception as e:
             print(f"  ⚠️ Error scraping video details: {str(e)}")
+            if controller is not None and start is not None:
+                controller.record(asyncio.get_event_loop().time() - start, ok=False)
             return None
     
-    async def _scrape_comments_from_page(self, page: Page, max_comments: int = 20) -> List[Dict]:
+    async def _scrape_comments_from_page(self, page: Page, max_comments: int = 20, cdp_sessions: Optional[Dict] = None) -> List[Dict]:
         """
         Scrape comments from a video page by scrolling the comment section
         
@@ -468,11 +846,14 @@ class TikTokHashtagScraper:
         Returns:
             List of comment dictionaries
         """
-        comments = []
-        
+        comments_out: List[Dict] = []
+
         try:
-            # Wait for comments to load
-            await asyncio.sleep(2)
+            # Wait for the comment button to load
+            try:
+                await page.wait_for_selector('[data-e2e="comment-icon"]', timeout=5000)
+            except PlaywrightTimeout:
+                pass
             
             # Try to find and click "View more comments" or scroll comment section
             # Different selectors for comment containers
@@ -486,39 +867,32 @@ class TikTokHashtagScraper:
             
             icon = await page.query_selector('[data-e2e="comment-icon"]')
             await icon.click()  # 🖱️ Click to load comments!
-            await asyncio.sleep(3)  # Wait for AJAX
-            comments = await page.query_selector_all('[data-e2e="comment-level-1"]')
-            
-            if not comments:
+            try:
+                await page.wait_for_selector('[data-e2e="comment-level-1"]', timeout=8000)
+            except PlaywrightTimeout:
+                pass
+            comment_elements = await page.query_selector_all('[data-e2e="comment-level-1"]')
+
+            if not comment_elements:
                 print(f"    ⚠️ No comment elements found")
                 return []
-            
+
             # Scroll within comment section to load more comments
             scroll_attempts = 0
             max_scroll = 5
-            
-            while len(comments) < max_comments and scroll_attempts < max_scroll:
+
+            while len(comment_elements) < max_comments and scroll_attempts < max_scroll:
                 # Try to scroll the comment section
                 try:
-                    await page.evaluate("""
-                        () => {
-                            const commentSection = document.querySelector('[data-e2e="comment-list"]') || 
-                                                  document.querySelector('[class*="CommentList"]');
-                            if (commentSection) {
-                                commentSection.scrollTop = commentSection.scrollHeight;
-                            } else {
-                                window.scrollTo(0, document.body.scrollHeight);
-                            }
-                        }
-                    """)
+                    await self._evaluate(page, '() => window.__scrapeScrollComments()', cdp_sessions)
                     await asyncio.sleep(1.5)
                     
                     # Re-query for comments
                     for selector in comment_selectors:
                         try:
                             elements = await page.query_selector_all(selector)
-                            if len(elements) > len(comments):
-                                comments = elements
+                            if len(elements) > len(comment_elements):
+                                comment_elements = elements
                                 break
                         except:
                             continue
@@ -528,98 +902,88 @@ class TikTokHashtagScraper:
                 
                 scroll_attempts += 1
             
-            # Extract comment data from elements
-            for i, element in enumerate(comments[:max_comments]):
-                try:
+            # Extract all comment fields in a single evaluate call; the
+            # fallback selectors are tried DOM-side, so no per-comment
+            # protocol round-trips remain
+            try:
+                raw_comments = await page.evaluate('opts => window.__scrapeComments(opts)', {
+                    'max': max_comments,
+                    'text': ['[data-e2e="comment-text"]', '[class*="CommentText"]', 'span[class*="SpanText"]'],
+                    'user': ['[data-e2e="comment-username"]', '[class*="CommentUsername"]', 'a[class*="StyledUserLinkName"]'],
+                    'like': ['[data-e2e="comment-like-count"]', '[class*="LikeCount"]'],
+                    'time': ['[data-e2e="comment-time"]', 'span[class*="CommentTime"]', 'time'],
+                })
+            except Exception:
+                raw_comments = []
+
+            for raw in raw_comments:
+                text = (raw.get('text') or '').strip()
+                if not text:  # Only keep comments we got text for
+                    continue
+                username = (raw.get('username') or '').strip()
+                comments_out.append({
+                    'text': text,
+                    'author': username if username else 'Unknown',
+                    'likes': self._parse_count(raw.get('like_text') or ''),
+                    'timestamp': (raw.get('timestamp') or '').strip()
+                })
+
+            # If the batched extraction came back empty (e.g. the init
+            # script was missing), fall back to per-element extraction
+            if not comments_out:
+                for element in comment_elements[:max_comments]:
                     comment_data = await self._extract_comment_data(element, page)
                     if comment_data:
-                        comments.append(comment_data)
-                except Exception as e:
-                    print(f"    ⚠️ Error extracting comment {i+1}: {str(e)}")
-                    continue
-            
+                        comments_out.append(comment_data)
+
         except Exception as e:
             print(f"    ⚠️ Error scraping comments: {str(e)}")
-        
-        return comments
+
+        return comments_out
     
     async def _extract_comment_data(self, element, page: Page) -> Optional[Dict]:
         """Extract data from a single comment element"""
         
         try:
+            # Comma-separated selector lists let the browser try every
+            # fallback in one pass instead of one round-trip per candidate
+
             # Extract comment text
-            text_selectors = [
-                '[data-e2e="comment-text"]',
-                '[class*="CommentText"]',
-                'span[class*="SpanText"]'
-            ]
-            
             comment_text = ""
-            for selector in text_selectors:
-                try:
-                    text_elem = await element.query_selector(selector)
-                    if text_elem:
-                        comment_text = await text_elem.inner_text()
-                        break
-                except:
-                    continue
-            
+            text_elem = await element.query_selector(
+                '[data-e2e="comment-text"], [class*="CommentText"], span[class*="SpanText"]'
+            )
+            if text_elem:
+                comment_text = await text_elem.inner_text()
+
             # If we still don't have text, try getting all text from element
             if not comment_text:
                 comment_text = await element.inner_text()
-            
+
             # Extract username
-            username_selectors = [
-                '[data-e2e="comment-username"]',
-                '[class*="CommentUsername"]',
-                'a[class*="StyledUserLinkName"]'
-            ]
-            
             username = ""
-            for selector in username_selectors:
-                try:
-                    user_elem = await element.query_selector(selector)
-                    if user_elem:
-                        username = await user_elem.inner_text()
-                        break
-                except:
-                    continue
-            
-            # Extract like count
-            like_selectors = [
-                '[data-e2e="comment-like-count"]',
-                '[class*="LikeCount"]'
-            ]
-            
+            user_elem = await element.query_selector(
+                '[data-e2e="comment-username"], [class*="CommentUsername"], a[class*="StyledUserLinkName"]'
+            )
+            if user_elem:
+                username = await user_elem.inner_text()
+
+            # Extract like count (handle K, M suffixes)
             likes = 0
-            for selector in like_selectors:
-                try:
-                    like_elem = await element.query_selector(selector)
-                    if like_elem:
-                        like_text = await like_elem.inner_text()
-                        # Parse like count (handle K, M suffixes)
-                        likes = self._parse_count(like_text)
-                        break
-                except:
-                    continue
-            
+            like_elem = await element.query_selector(
+                '[data-e2e="comment-like-count"], [class*="LikeCount"]'
+            )
+            if like_elem:
+                likes = self._parse_count(await like_elem.inner_text())
+
             # Extract timestamp
-            time_selectors = [
-                '[data-e2e="comment-time"]',
-                'span[class*="CommentTime"]',
-                'time'
-            ]
-            
             timestamp = ""
-            for selector in time_selectors:
-                try:
-                    time_elem = await element.query_selector(selector)
-                    if time_elem:
-                        timestamp = await time_elem.inner_text()
-                        break
-                except:
-                    continue
-            
+            time_elem = await element.query_selector(
+                '[data-e2e="comment-time"], span[class*="CommentTime"], time'
+            )
+            if time_elem:
+                timestamp = await time_elem.inner_text()
+
             if comment_text:  # Only return if we got the text
                 return {
                     'text': comment_text.strip(),
@@ -635,15 +999,18 @@ class TikTokHashtagScraper:
     
     def _parse_count(self, count_str: str) -> int:
         """Parse count strings like '1.2K', '3M' to integers"""
+        count_str = count_str.strip()
+        if not count_str:
+            return 0
+        mult = _COUNT_SUFFIXES.get(count_str[-1].upper())
+        if mult:
+            try:
+                return int(float(count_str[:-1]) * mult)
+            except ValueError:
+                return 0
         try:
-            count_str = count_str.strip().upper()
-            if 'K' in count_str:
-                return int(float(count_str.replace('K', '')) * 1000)
-            elif 'M' in count_str:
-                return int(float(count_str.replace('M', '')) * 1000000)
-            else:
-                return int(count_str)
-        except:
+            return int(count_str.replace(',', ''))
+        except ValueError:
             return 0
     
     def _parse_video_details_json(self, data: Dict, video_url: str) -> Optional[Dict]:
@@ -739,72 +1106,178 @@ class TikTokHashtagScraper:
 
 
 
+def _bounded_int(lo: int, hi: int):
+    """argparse type for an int constrained to [lo, hi]"""
+    def parse(s: str) -> int:
+        v = int(s)
+        if not lo <= v <= hi:
+            raise argparse.ArgumentTypeError(f"value must be between {lo} and {hi}")
+        return v
+    return parse
+
+
+def _bounded_float(lo: float, hi: float):
+    """argparse type for a float constrained to [lo, hi]"""
+    def parse(s: str) -> float:
+        v = float(s)
+        if not lo <= v <= hi:
+            raise argparse.ArgumentTypeError(f"value must be between {lo} and {hi}")
+        return v
+    return parse
+
+
 async def main():
     """Main function to run the scraper"""
     
     parser = argparse.ArgumentParser(description='TikTok Hashtag Scraper')
-    parser.add_argument('hashtag', help='Hashtag to scrape (with or without #)')
-    parser.add_argument('--max-videos', type=int, default=30, help='Maximum number of videos to scrape')
-    parser.add_argument('--output', default='tiktok_hashtag_data.json', help='Output JSON file')
+    parser.add_argument('hashtags', nargs='+', help='Hashtag(s) to scrape (with or without #)')
+    parser.add_argument('--max-videos', type=_bounded_int(1, 10000), default=30,
+                        help='Maximum number of videos to scrape (1-10000)')
+    parser.add_argument('--output', default='tiktok_hashtag_data.json',
+                        help='Output JSON file. With --format jsonl, <output>.jsonl is written instead: '
+                             'one record per line (a type-tagged hashtag_info line, then one video '
+                             'per line), so downstream scripts can parse it line by line with '
+                             'constant memory instead of json.load-ing the whole document')
     parser.add_argument('--headless', action='store_true', help='Run in headless mode')
     parser.add_argument('--proxy', help='Proxy server (e.g., http://proxy:port)')
-    parser.add_argument('--scroll-pause', type=float, default=2.0, help='Pause between scrolls (seconds)')
+    parser.add_argument('--scroll-pause', type=_bounded_float(0.1, 60.0), default=2.0,
+                        help='Pause between scrolls (seconds, 0.1-60)')
     parser.add_argument('--detailed', action='store_true', help='Enable detailed scraping (visits each video page)')
-    parser.add_argument('--video-delay', type=float, default=1.5, help='Delay between video page requests (seconds)')
+    parser.add_argument('--video-delay', type=_bounded_float(0.0, 60.0), default=1.5,
+                        help='Delay between video page requests (seconds, 0-60)')
     parser.add_argument('--scrape-comments', action='store_true', help='Scrape comments from videos')
-    parser.add_argument('--max-comments', type=int, default=20, help='Maximum comments to scrape per video')
-    
+    parser.add_argument('--max-comments', type=_bounded_int(1, 10000), default=20,
+                        help='Maximum comments to scrape per video (1-10000)')
+    parser.add_argument('--concurrency', type=_bounded_int(1, 32), default=8,
+                        help='Number of video pages scraped in parallel during detailed scraping (1-32)')
+    parser.add_argument('--format', choices=['json', 'jsonl', 'msgpack'], default='json',
+                        help='Output format: json buffers one document per hashtag; jsonl streams '
+                             'records to <output>.jsonl as they finish; msgpack writes a binary '
+                             '<output>.msgpack (requires the ormsgpack package)')
+    parser.add_argument('--compress', action='store_true',
+                        help='Compress the JSON output with zstd, writing <output>.zst '
+                             '(requires the zstandard package)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Track detail-scraped video IDs in <output>.ckpt and skip them on restart '
+                             '(pairs best with --format jsonl, which then appends)')
+
     args = parser.parse_args()
-    
-    # Create scraper
-    scraper = TikTokHashtagScraper(headless=args.headless, proxy=args.proxy)
-    
-    # Scrape hashtag
-    data = await scraper.scrape_hashtag(
-        hashtag=args.hashtag,
-        max_videos=args.max_videos,
-        scroll_pause=args.scroll_pause,
-        detailed_scrape=args.detailed,
-        video_delay=args.video_delay,
-        scrape_comments=args.scrape_comments,
-        max_comments=args.max_comments
-    )
-    def clean_for_json(obj):
-        """Recursively clean data to ensure JSON serializability"""
-        if isinstance(obj, dict):
-            return {k: clean_for_json(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [clean_for_json(item) for item in obj]
-        elif isinstance(obj, (str, int, float, bool, type(None))):
-            return obj
+
+    multiple = len(args.hashtags) > 1
+
+    def output_path_for(hashtag: str) -> str:
+        # One output file per hashtag; the single-hashtag case keeps the
+        # plain --output name
+        return f"{hashtag.lstrip('#')}_{args.output}" if multiple else args.output
+
+    # When streaming, open each hashtag's .jsonl up front so videos hit
+    # disk as they finish and peak memory stays flat
+    streams = {}
+    if args.format == 'jsonl':
+        mode = 'ab' if args.resume else 'wb'
+        for h in args.hashtags:
+            streams[h] = open(output_path_for(h) + '.jsonl', mode)
+    elif args.resume:
+        print("⚠️ --resume without --format jsonl rewrites the output from scratch; "
+              "checkpointed videos will be scraped again")
+
+    try:
+        # Create scraper; one browser is shared by every hashtag and the
+        # scrapes run concurrently
+        async with TikTokHashtagScraper(headless=args.headless, proxy=args.proxy) as scraper:
+            results = await asyncio.gather(
+                *(scraper.scrape_hashtag(
+                    hashtag=h,
+                    max_videos=args.max_videos,
+                    scroll_pause=args.scroll_pause,
+                    detailed_scrape=args.detailed,
+                    video_delay=args.video_delay,
+                    scrape_comments=args.scrape_comments,
+                    max_comments=args.max_comments,
+                    concurrency=args.concurrency,
+                    output_stream=streams.get(h),
+                    checkpoint_path=output_path_for(h) + '.ckpt' if args.resume else None
+                ) for h in args.hashtags),
+                return_exceptions=True
+            )
+    finally:
+        for stream in streams.values():
+            stream.close()
+
+    def _save_result(data, output: str) -> str:
+        """Encode and write one hashtag's result; returns the path written"""
+        if args.format == 'msgpack':
+            if _HAS_ORMSGPACK:
+                output = output + '.msgpack'
+                with open(output, 'wb') as f:
+                    f.write(ormsgpack.packb(data, default=str))
+                return output
+            print("⚠️ ormsgpack not installed; falling back to JSON output")
+
+        # default=str stringifies unknown leaves lazily during the encoder's
+        # single walk, replacing the old clean_for_json pre-pass (whose
+        # fallback was literally str()) and halving peak memory
+        if _HAS_ORJSON:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
         else:
-            # Convert anything else to string
-            return str(obj)
+            # json.dump calls f.write() per token; encode once, write once
+            payload = json.dumps(data, indent=2, ensure_ascii=False, default=str).encode('utf-8')
 
-    data = clean_for_json(data)
+        if args.compress and _HAS_ZSTD:
+            output = output + '.zst'
+            # threads=-1 engages zstd's multi-threaded encoder
+            cctx = zstd.ZstdCompressor(level=6, threads=-1)
+            with open(output, 'wb') as f, cctx.stream_writer(f) as writer:
+                writer.write(payload)
+        else:
+            if args.compress:
+                print("⚠️ zstandard not installed; writing uncompressed output")
+            with open(output, 'wb') as f:
+                f.write(payload)
+        return output
 
-    
-    # Save to file
-    with open(args.output, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n💾 Data saved to: {args.output}")
-    print(f"📊 Total videos scraped: {len(data.get('videos', []))}")
-    
-    # Print summary
-    if data.get('hashtag_info'):
-        info = data['hashtag_info']
-        print("\n📈 Hashtag Stats:")
-        print(f"  Views: {info.get('view_count', 'N/A')}")
-        print(f"  Videos: {info.get('video_count', 'N/A')}")
-    
-    # Print comment stats if scraped
-    if args.scrape_comments:
-        total_comments = sum(len(v.get('comments', [])) for v in data.get('videos', []))
-        videos_with_comments = sum(1 for v in data.get('videos', []) if v.get('comments'))
-        print(f"\n💬 Comment Stats:")
-        print(f"  Total comments scraped: {total_comments}")
-        print(f"  Videos with comments: {videos_with_comments}/{len(data.get('videos', []))}")
+    for hashtag, data in zip(args.hashtags, results):
+        if isinstance(data, Exception):
+            print(f"\n❌ Error scraping #{hashtag.lstrip('#')}: {str(data)}")
+            continue
+
+        output = output_path_for(hashtag)
+
+        # Save to file; orjson encodes large nested payloads an order of
+        # magnitude faster and emits UTF-8 bytes in one shot
+        if args.format == 'jsonl':
+            # Records were streamed to disk during the scrape
+            output = output + '.jsonl'
+        else:
+            # Encoding and writing multi-MB payloads can stall for seconds;
+            # run it in a thread so the event loop stays responsive
+            output = await asyncio.to_thread(_save_result, data, output)
+
+        videos = data.get('videos') or []
+        info = data.get('hashtag_info')
+
+        print(f"\n💾 Data saved to: {output}")
+        print(f"📊 Total videos scraped: {len(videos)}")
+
+        # Print summary
+        if info:
+            print("\n📈 Hashtag Stats:")
+            print(f"  Views: {info.get('view_count', 'N/A')}")
+            print(f"  Videos: {info.get('video_count', 'N/A')}")
+
+        # Print comment stats if scraped
+        if args.scrape_comments:
+            # One pass over the videos, one .get('comments') per video
+            total_comments = 0
+            videos_with_comments = 0
+            for v in videos:
+                c = v.get('comments')
+                if c:
+                    videos_with_comments += 1
+                    total_comments += len(c)
+            print(f"\n💬 Comment Stats:")
+            print(f"  Total comments scraped: {total_comments}")
+            print(f"  Videos with comments: {videos_with_comments}/{len(videos)}")
 
 
 if __name__ == "__main__":